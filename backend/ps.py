@@ -12,20 +12,25 @@ Features:
 """
 
 import os
-import json
+import re
+import asyncio
 import hashlib
-import calendar
 from datetime import datetime, timedelta
+from itertools import islice
+from operator import itemgetter
 from typing import Optional, List, Dict, Any
 from functools import lru_cache
 from dateutil.relativedelta import relativedelta
+from cachetools import TTLCache
 
+import ciso8601
 import httpx
+import orjson
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from anthropic import Anthropic
-from starlette.concurrency import run_in_threadpool
+from anthropic import AsyncAnthropic
 from contextlib import asynccontextmanager
 import dotenv
 
@@ -36,11 +41,29 @@ http_client: Optional[httpx.AsyncClient] = None
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global http_client
-    http_client = httpx.AsyncClient(timeout=30.0)
+    # Large keep-alive pool + per-phase timeouts: bursts to PatentsView reuse
+    # warm connections instead of hitting PoolTimeout or re-doing TLS setup,
+    # and HTTP/2 multiplexes concurrent calls over one connection per host
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=512,
+            max_keepalive_connections=128,
+            keepalive_expiry=60.0,
+        ),
+        timeout=httpx.Timeout(connect=5.0, read=25.0, write=10.0, pool=5.0),
+        http2=True,
+    )
     yield
     await http_client.aclose()
-
-app = FastAPI(title="PatentSentry API", version="4.0.0", lifespan=lifespan)
+    if _redis_client is not None:
+        await _redis_client.aclose()
+
+app = FastAPI(
+    title="PatentSentry API",
+    version="4.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -52,32 +75,116 @@ app.add_middleware(
 
 # API clients (lazy initialization)
 _claude_client = None
-_exa_client = None
+
+EXA_SEARCH_URL = "https://api.exa.ai/search"
+
+# Budget for Claude query expansion before falling back to the raw query
+AI_EXPANSION_TIMEOUT_SECONDS = 2.0
+
+# Per-provider concurrency caps so backpressure from one slow service can't
+# starve calls to the other
+_claude_semaphore = asyncio.Semaphore(20)
+_exa_semaphore = asyncio.Semaphore(40)
 
 def get_claude_client():
     global _claude_client
     if _claude_client is None:
         api_key = os.environ.get("ANTHROPIC_API_KEY")
         if api_key:
-            _claude_client = Anthropic(api_key=api_key)
+            _claude_client = AsyncAnthropic(api_key=api_key)
     return _claude_client
 
-def get_exa_client():
-    global _exa_client
-    if _exa_client is None:
-        api_key = os.environ.get("EXA_API_KEY")
-        if api_key:
-            try:
-                from exa_py import Exa
-                _exa_client = Exa(api_key=api_key)
-            except ImportError:
-                pass
-    return _exa_client
-
-# In-memory caches with TTL
-_enrichment_cache: Dict[str, Dict[str, Any]] = {}
-_analysis_cache: Dict[str, Dict[str, Any]] = {}
+# In-memory caches: bounded LRU with per-entry TTL, expiry handled by cachetools
 CACHE_TTL_SECONDS = 3600 * 24  # 24 hours
+_enrichment_cache: TTLCache = TTLCache(maxsize=5000, ttl=CACHE_TTL_SECONDS)
+_analysis_cache: TTLCache = TTLCache(maxsize=5000, ttl=CACHE_TTL_SECONDS)
+_keyword_cache: TTLCache = TTLCache(maxsize=5000, ttl=CACHE_TTL_SECONDS)
+
+# Optional Redis tier behind the in-process caches: set REDIS_URL to share
+# analyze/enrich hits across workers and survive restarts. Each entry is also
+# written under a stale: key with a longer TTL so an upstream outage can be
+# served from the last known good response.
+STALE_TTL_SECONDS = CACHE_TTL_SECONDS * 7
+_redis_client = None
+if os.environ.get("REDIS_URL"):
+    try:
+        import redis.asyncio as redis
+        _redis_client = redis.from_url(os.environ["REDIS_URL"])
+    except ImportError:
+        pass
+
+async def cache_get(cache: TTLCache, key: str) -> Optional[Dict]:
+    """Look up a response in the local cache, falling back to Redis."""
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    if _redis_client is not None:
+        try:
+            raw = await _redis_client.get(key)
+        except Exception as e:
+            print(f"[cache] Redis get failed: {e}")
+            return None
+        if raw is not None:
+            value = orjson.loads(raw)
+            cache[key] = value  # repopulate the local tier
+            return value
+    return None
+
+async def cache_set(cache: TTLCache, key: str, value: Dict) -> None:
+    """Store a response in the local cache and, if configured, Redis."""
+    cache[key] = value
+    if _redis_client is not None:
+        try:
+            raw = orjson.dumps(value)
+            await _redis_client.set(key, raw, ex=CACHE_TTL_SECONDS)
+            await _redis_client.set(f"stale:{key}", raw, ex=STALE_TTL_SECONDS)
+        except Exception as e:
+            print(f"[cache] Redis set failed: {e}")
+
+async def cache_get_stale(key: str) -> Optional[Dict]:
+    """Fetch the last known good response for a key, however old."""
+    if _redis_client is None:
+        return None
+    try:
+        raw = await _redis_client.get(f"stale:{key}")
+    except Exception as e:
+        print(f"[cache] Redis stale get failed: {e}")
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+# Single-flight registry: concurrent requests for the same key share one fetch
+_inflight: Dict[str, asyncio.Future] = {}
+_inflight_lock = asyncio.Lock()
+
+async def single_flight(key: str, fetch) -> Any:
+    """Run `fetch` once per key across concurrent callers.
+
+    The first caller for a key executes the fetch; callers that arrive while
+    it is in flight await the same result instead of issuing duplicate
+    upstream API calls.
+    """
+    async with _inflight_lock:
+        fut = _inflight.get(key)
+        owner = fut is None
+        if owner:
+            fut = asyncio.get_event_loop().create_future()
+            _inflight[key] = fut
+
+    if not owner:
+        return await fut
+
+    try:
+        result = await fetch()
+        fut.set_result(result)
+        return result
+    except BaseException as exc:
+        fut.set_exception(exc)
+        fut.exception()  # mark retrieved so lone failures don't log warnings
+        raise
+    finally:
+        async with _inflight_lock:
+            _inflight.pop(key, None)
 
 # =============================================================================
 # Request Models
@@ -104,33 +211,45 @@ class UnifiedRequest(BaseModel):
 # Utility Functions
 # =============================================================================
 
-STOPWORDS = {
+STOPWORDS = frozenset({
     'a', 'an', 'the', 'and', 'or', 'but', 'for', 'of', 'to', 'in', 'on', 'at',
     'by', 'with', 'from', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
     'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
     'may', 'might', 'must', 'shall', 'can', 'this', 'that', 'these', 'those',
     'method', 'system', 'apparatus', 'device', 'thereof', 'therefor', 'therein',
     'comprising', 'including', 'having', 'using', 'making', 'forming',
-}
+})
+
+_NON_ALNUM = re.compile(r'[^a-z0-9\s]')
+
+@lru_cache(maxsize=4096)
+def normalize_patent_id(patent_id: str) -> str:
+    """Strip whitespace and a leading "US" prefix from a patent identifier.
+
+    Memoized because the same IDs recur across analyze/citations/details
+    round trips within a session.
+    """
+    return patent_id.strip().upper().removeprefix("US").strip()
 
 def extract_key_terms(title: str) -> List[str]:
     """Extract meaningful terms from patent title."""
-    import re
-    terms = re.sub(r'[^a-z0-9\s]', ' ', title.lower()).split()
-    unique_terms = []
-    seen = set()
-    for term in terms:
-        if len(term) > 2 and term not in STOPWORDS and term not in seen:
-            unique_terms.append(term)
-            seen.add(term)
-            if len(unique_terms) >= 6:
-                break
-    return unique_terms
-
-def calculate_expiry(filing_str: str, pta_days: int = 0, pte_days: int = 0, td_date_str: Optional[str] = None):
-    """Calculate patent expiration date with adjustments."""
+    # dict.fromkeys dedupes while preserving first-seen order in C
+    return list(dict.fromkeys(
+        t for t in _NON_ALNUM.sub(' ', title.lower()).split()
+        if len(t) > 2 and t not in STOPWORDS
+    ))[:6]
+
+def calculate_expiry(filing_str: str, pta_days: int = 0, pte_days: int = 0, td_date_str: Optional[str] = None,
+                     now: Optional[datetime] = None):
+    """Calculate patent expiration date with adjustments.
+
+    `now` lets callers stamp a whole batch of patents against one clock read
+    instead of calling datetime.now() per patent.
+    """
+    if now is None:
+        now = datetime.now()
     fmt = "%Y-%m-%d"
-    filing_date = datetime.strptime(filing_str, fmt)
+    filing_date = ciso8601.parse_datetime(filing_str)
     
     # Add exactly 20 calendar years from filing date, preserving month/day
     # and handling end-of-month edge cases (e.g., Feb 29 -> Feb 28 on non-leap years)
@@ -148,88 +267,95 @@ def calculate_expiry(filing_str: str, pta_days: int = 0, pte_days: int = 0, td_d
     final_date = adjusted_date
     
     if td_date_str:
-        td_date = datetime.strptime(td_date_str, fmt)
+        td_date = ciso8601.parse_datetime(td_date_str)
         if td_date < adjusted_date:
             final_date = td_date
             reason = "Terminal Disclaimer (expires with linked patent)"
     
+    # strftime once per distinct date; expiry and calculated_expiry share it
+    final_str = final_date.strftime(fmt)
     return {
-        "expiry": final_date.strftime(fmt),
+        "expiry": final_str,
         "reason": reason,
-        "is_active": datetime.now() < final_date,
+        "is_active": now < final_date,
         "baseline_expiry": baseline.strftime(fmt),
         "pta_days": pta_days or 0,
         "pte_days": pte_days or 0,
-        "calculated_expiry": final_date.strftime(fmt)
+        "calculated_expiry": final_str
     }
 
-def is_leap_year(year: int) -> bool:
-    """Check if a year is a leap year."""
-    return (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
+_DESIGN_TERM_CUTOFF = datetime(2015, 5, 13)  # 14-year vs 15-year term boundary
 
-def calculate_design_patent_expiry(grant_date_str: str, filing_date_str: str) -> Dict:
+def calculate_design_patent_expiry(grant_date_str: str, filing_date_str: str,
+                                   now: Optional[datetime] = None) -> Dict:
     """Calculate expiration for design patents.
     
     Design patents filed before 2015-05-13: 14 years from grant date
     Design patents filed on/after 2015-05-13: 15 years from grant date
     """
+    if now is None:
+        now = datetime.now()
     fmt = "%Y-%m-%d"
-    grant_date = datetime.strptime(grant_date_str, fmt)
-    filing_date = datetime.strptime(filing_date_str, fmt)
-    
-    cutoff_date = datetime.strptime("2015-05-13", fmt)
-    years_to_add = 15 if filing_date >= cutoff_date else 14
+    grant_date = ciso8601.parse_datetime(grant_date_str)
+    filing_date = ciso8601.parse_datetime(filing_date_str)
+
+    years_to_add = 15 if filing_date >= _DESIGN_TERM_CUTOFF else 14
     
     # Add years to grant date, handling leap year edge case (Feb 29)
     baseline = grant_date + relativedelta(years=years_to_add)
     
     reason = f"{years_to_add} years from grant date"
     
+    # All three expiry fields are the same date; format it once
+    baseline_str = baseline.strftime(fmt)
     return {
-        "expiry": baseline.strftime(fmt),
+        "expiry": baseline_str,
         "reason": reason,
-        "is_active": datetime.now() < baseline,
-        "baseline_expiry": baseline.strftime(fmt),
+        "is_active": now < baseline,
+        "baseline_expiry": baseline_str,
         "pta_days": 0,
         "pte_days": 0,
-        "calculated_expiry": baseline.strftime(fmt)
+        "calculated_expiry": baseline_str
     }
 
+# Maintenance fee windows (utility patents): fees are due 3.5/7.5/11.5 years
+# from grant; each window opens 6 months before the due date and the surcharge
+# period runs 6 months after it. The offsets are fixed, so build them once.
+_FEE_WINDOWS = tuple(
+    (
+        label,
+        relativedelta(years=years),             # window opens
+        relativedelta(years=years, months=6),   # due date / window closes
+        relativedelta(years=years + 1),         # surcharge period ends
+    )
+    for label, years in (("year_3_5", 3), ("year_7_5", 7), ("year_11_5", 11))
+)
+
 def calculate_maintenance_fees(grant_date_str: str) -> Dict:
     """Calculate maintenance fee schedule from grant date."""
-    grant_date = datetime.strptime(grant_date_str, "%Y-%m-%d")
-    
-    def add_years_months(date: datetime, years: int, months: int = 0) -> datetime:
-        new_month = date.month + months
-        new_year = date.year + years + (new_month - 1) // 12
-        new_month = ((new_month - 1) % 12) + 1
-        last_day_of_month = calendar.monthrange(new_year, new_month)[1]
-        clamped_day = min(date.day, last_day_of_month)
-        return date.replace(year=new_year, month=new_month, day=clamped_day)
-    
-    year_3_5 = add_years_months(grant_date, 3, 6)
-    year_7_5 = add_years_months(grant_date, 7, 6)
-    year_11_5 = add_years_months(grant_date, 11, 6)
-    
-    def fee_schedule(due_date: datetime) -> Dict:
-        return {
-            "due_date": due_date.strftime("%Y-%m-%d"),
-            "window_start": add_years_months(due_date, 0, -6).strftime("%Y-%m-%d"),
-            "window_end": due_date.strftime("%Y-%m-%d"),
-            "surcharge_end": add_years_months(due_date, 0, 6).strftime("%Y-%m-%d"),
+    fmt = "%Y-%m-%d"
+    grant_date = ciso8601.parse_datetime(grant_date_str)
+
+    schedule = {}
+    for label, opens, due, surcharge in _FEE_WINDOWS:
+        due_str = (grant_date + due).strftime(fmt)
+        schedule[label] = {
+            "due_date": due_str,
+            "window_start": (grant_date + opens).strftime(fmt),
+            "window_end": due_str,
+            "surcharge_end": (grant_date + surcharge).strftime(fmt),
         }
-    
-    return {
-        "year_3_5": fee_schedule(year_3_5),
-        "year_7_5": fee_schedule(year_7_5),
-        "year_11_5": fee_schedule(year_11_5),
-    }
+    return schedule
 
+@lru_cache(maxsize=1)
 def get_patentsview_headers() -> Dict:
-    """Get headers for PatentsView API calls."""
-    api_key = os.environ.get("PATENTSVIEW_API_KEY", "")
+    """Get headers for PatentsView API calls.
+
+    Memoized: the API key doesn't change at runtime, so build the dict once
+    instead of on every outbound request.
+    """
     return {
-        "X-Api-Key": api_key,
+        "X-Api-Key": os.environ.get("PATENTSVIEW_API_KEY", ""),
         "Content-Type": "application/json"
     }
 
@@ -237,32 +363,55 @@ def get_patentsview_headers() -> Dict:
 # Action Handlers
 # =============================================================================
 
+# Destructures a PatentsView search row in one C-level call
+_SEARCH_ROW = itemgetter(
+    "patent_id", "patent_title", "patent_abstract", "patent_date",
+    "patent_earliest_application_date", "patent_type", "assignees", "inventors"
+)
+
 async def handle_search(req: UnifiedRequest) -> Dict:
     """Search patents via PatentsView API with optional AI query expansion."""
     query = req.query
     if not query or not query.strip():
         raise HTTPException(status_code=400, detail="Query parameter is required")
     
-    # Optional: AI-powered query expansion
+    # Optional: AI-powered query expansion. Bounded by a short timeout so a
+    # slow Claude response never holds up the PatentsView search; on timeout
+    # we fall back to the raw query. Successful expansions are cached per
+    # normalized query so repeat searches skip Claude entirely, and
+    # single_flight coalesces concurrent identical searches into one call.
     claude = get_claude_client()
     keywords = [query]
-    
-    if claude:
+    norm_query = query.strip().lower()
+
+    async def expand_keywords() -> List[str]:
         try:
-            response = await run_in_threadpool(
-                lambda: claude.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=256,
-                    system="You are a patent search expert. Convert the user's input into 3-5 synonymous keywords/phrases for patent search. Return ONLY a JSON array of strings.",
-                    messages=[{"role": "user", "content": query}]
+            async with _claude_semaphore:
+                response = await asyncio.wait_for(
+                    claude.messages.create(
+                        model="claude-sonnet-4-20250514",
+                        max_tokens=256,
+                        system="You are a patent search expert. Convert the user's input into 3-5 synonymous keywords/phrases for patent search. Return ONLY a JSON array of strings.",
+                        messages=[{"role": "user", "content": query}]
+                    ),
+                    timeout=AI_EXPANSION_TIMEOUT_SECONDS,
                 )
-            )
-            parsed_keywords = json.loads(response.content[0].text)
+            parsed_keywords = orjson.loads(response.content[0].text)
             if isinstance(parsed_keywords, list) and len(parsed_keywords) > 0:
-                keywords = parsed_keywords
-            print(f"[search] AI keywords: {keywords}")
+                _keyword_cache[norm_query] = parsed_keywords
+                print(f"[search] AI keywords: {parsed_keywords}")
+                return parsed_keywords
+        except asyncio.TimeoutError:
+            print("[search] AI expansion timed out, using raw query")
         except Exception as e:
             print(f"[search] AI expansion failed: {e}")
+        return [query]
+
+    if claude:
+        try:
+            keywords = _keyword_cache[norm_query]
+        except KeyError:
+            keywords = await single_flight(f"keywords:{norm_query}", expand_keywords)
     
     # Build PatentsView query
     url = "https://search.patentsview.org/api/v1/patent/"
@@ -294,31 +443,44 @@ async def handle_search(req: UnifiedRequest) -> Dict:
     try:
         r = await http_client.post(url, headers=get_patentsview_headers(), json=body)
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         
         patents = []
+        now = datetime.now()  # one clock read stamps every row consistently
         for p in data.get("patents", []):
-            filing_date = p.get("patent_earliest_application_date")
-            grant_date = p.get("patent_date")
-            
+            # One C-level tuple unpack instead of eight .get lookups per row;
+            # every field is requested in "f" above, so keys are present
+            try:
+                (pid, title, abstract, grant_date, filing_date,
+                 patent_type, assignees, inventors) = _SEARCH_ROW(p)
+            except KeyError:
+                pid = p["patent_id"]
+                title = p.get("patent_title")
+                abstract = p.get("patent_abstract")
+                grant_date = p.get("patent_date")
+                filing_date = p.get("patent_earliest_application_date")
+                patent_type = p.get("patent_type")
+                assignees = p.get("assignees")
+                inventors = p.get("inventors")
+
             expiration_info = None
-            if filing_date and grant_date and p.get("patent_type") != "design":
-                expiration_info = calculate_expiry(filing_date, 0, 0, None)
-            
+            if filing_date and grant_date and patent_type != "design":
+                expiration_info = calculate_expiry(filing_date, 0, 0, None, now)
+
             patents.append({
-                "patent_id": f"US{p['patent_id']}",
-                "patent_number": p["patent_id"],
-                "patent_title": p.get("patent_title"),
-                "patent_abstract": p.get("patent_abstract"),
+                "patent_id": f"US{pid}",
+                "patent_number": pid,
+                "patent_title": title,
+                "patent_abstract": abstract,
                 "patent_date": grant_date,
                 "filing_date": filing_date,
-                "patent_type": p.get("patent_type"),
+                "patent_type": patent_type,
                 "expiration_date": expiration_info["expiry"] if expiration_info else None,
                 "is_active": expiration_info["is_active"] if expiration_info else None,
-                "assignees": p.get("assignees", []),
-                "inventors": p.get("inventors", []),
+                "assignees": assignees or [],
+                "inventors": inventors or [],
                 "source": "patentsview",
-                "url": f"https://patents.google.com/patent/US{p['patent_id']}",
+                "url": f"https://patents.google.com/patent/US{pid}",
             })
         
         total = data.get("total_hits", data.get("count", 0))
@@ -346,14 +508,14 @@ async def handle_analyze(req: UnifiedRequest) -> Dict:
         raise HTTPException(status_code=400, detail="patent_id required")
     
     # Parse patent number
-    patent_num = patent_id.upper().replace("US", "").strip()
+    patent_num = normalize_patent_id(patent_id)
     
-    # Check cache
+    # Check the local cache, then the shared Redis tier
     cache_key = f"analyze:{patent_num}"
-    if not req.force_refresh and cache_key in _analysis_cache:
-        cached = _analysis_cache[cache_key]
-        if datetime.now().timestamp() - cached["timestamp"] < CACHE_TTL_SECONDS:
-            return {**cached["data"], "from_cache": True}
+    if not req.force_refresh:
+        cached = await cache_get(_analysis_cache, cache_key)
+        if cached is not None:
+            return {**cached, "from_cache": True}
     
     url = "https://search.patentsview.org/api/v1/patent/"
     body = {
@@ -365,16 +527,17 @@ async def handle_analyze(req: UnifiedRequest) -> Dict:
         ],
         "o": {"size": 1}
     }
-    
-    try:
+
+    async def fetch_analysis() -> Dict:
         r = await http_client.post(url, headers=get_patentsview_headers(), json=body)
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         
         if not data.get("patents"):
             raise HTTPException(status_code=404, detail="Patent not found")
         
         p = data["patents"][0]
+        now = datetime.now()
         filing_date = p.get("patent_earliest_application_date")
         grant_date = p.get("patent_date")
         pte_days = p.get("patent_term_extension") or 0
@@ -390,11 +553,11 @@ async def handle_analyze(req: UnifiedRequest) -> Dict:
             # Design patents use different expiry rules
             if not grant_date:
                 raise HTTPException(status_code=400, detail="Grant date required for design patent expiry calculation")
-            expiration = calculate_design_patent_expiry(grant_date, filing_date)
+            expiration = calculate_design_patent_expiry(grant_date, filing_date, now)
             maintenance_fees = None  # Design patents don't have maintenance fees
         else:
             # Utility/plant patents use standard 20-year rule with PTA/PTE
-            expiration = calculate_expiry(filing_date, 0, pte_days, None)
+            expiration = calculate_expiry(filing_date, 0, pte_days, None, now)
             maintenance_fees = calculate_maintenance_fees(grant_date) if grant_date else None
         
         result = {
@@ -426,10 +589,17 @@ async def handle_analyze(req: UnifiedRequest) -> Dict:
         }
         
         # Cache the result
-        _analysis_cache[cache_key] = {"data": result, "timestamp": datetime.now().timestamp()}
-        
+        await cache_set(_analysis_cache, cache_key, result)
+
         return result
+
+    try:
+        return await single_flight(cache_key, fetch_analysis)
     except httpx.HTTPError as e:
+        # Upstream is down: serve the last known good response if we have one
+        stale = await cache_get_stale(cache_key)
+        if stale is not None:
+            return {**stale, "from_cache": True, "stale": True}
         raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
 
 async def handle_enrich(req: UnifiedRequest) -> Dict:
@@ -438,8 +608,8 @@ async def handle_enrich(req: UnifiedRequest) -> Dict:
     if not patent_id:
         raise HTTPException(status_code=400, detail="patent_id required")
     
-    exa = get_exa_client()
-    if not exa:
+    exa_api_key = os.environ.get("EXA_API_KEY")
+    if not exa_api_key:
         return {
             "patent_id": patent_id,
             "available": False,
@@ -460,12 +630,12 @@ async def handle_enrich(req: UnifiedRequest) -> Dict:
             "product_mentions": [],
         }
     
-    # Check cache
+    # Check the local cache, then the shared Redis tier
     cache_key = f"enrich:{patent_id}"
-    if not req.force_refresh and cache_key in _enrichment_cache:
-        cached = _enrichment_cache[cache_key]
-        if datetime.now().timestamp() - cached["timestamp"] < CACHE_TTL_SECONDS:
-            return {**cached["data"], "from_cache": True}
+    if not req.force_refresh:
+        cached = await cache_get(_enrichment_cache, cache_key)
+        if cached is not None:
+            return {**cached, "from_cache": True}
     
     print(f"[enrich] Fetching for {patent_id}, assignee: {assignee}")
     
@@ -477,52 +647,63 @@ async def handle_enrich(req: UnifiedRequest) -> Dict:
     
     async def query_exa(query: str) -> List[Dict]:
         try:
-            results = await run_in_threadpool(
-                lambda: exa.search(
-                    query=query,
-                    num_results=5,
-                    start_published_date=start_date,
-                    use_autoprompt=False,
+            async with _exa_semaphore:
+                r = await http_client.post(
+                    EXA_SEARCH_URL,
+                    headers={"x-api-key": exa_api_key, "Content-Type": "application/json"},
+                    json={
+                        "query": query,
+                        "numResults": 5,
+                        "startPublishedDate": start_date,
+                        "useAutoprompt": False,
+                        "contents": {"text": True},
+                    },
                 )
-            )
+            r.raise_for_status()
             return [
                 {
-                    "title": r.title or "",
-                    "url": r.url or "",
-                    "snippet": (r.text or "")[:300],
-                    "date": r.published_date,
-                    "source": r.url.split("/")[2].replace("www.", "") if r.url else "",
+                    "title": item.get("title") or "",
+                    "url": item.get("url") or "",
+                    "snippet": (item.get("text") or "")[:300],
+                    "date": item.get("publishedDate"),
+                    "source": item["url"].split("/")[2].replace("www.", "") if item.get("url") else "",
                 }
-                for r in results.results
+                for item in orjson.loads(r.content).get("results", [])
             ]
         except Exception as e:
             print(f"[enrich] Exa query error: {e}")
             return []
     
-    # Run queries
-    company_news = await query_exa(
-        f'"{assignee}" (funding OR partnership OR acquisition OR lawsuit OR patent OR regulation)'
-    )
-    market_context = await query_exa(
-        f"{tech_context} market analysis industry report adoption competitors"
-    )
-    product_mentions = await query_exa(
-        f'"{assignee}" {" ".join(key_terms[:2])} (product OR launch OR "powered by" OR announces)'
-    )
-    
-    result = {
-        "patent_id": patent_id,
-        "available": True,
-        "assignee": assignee,
-        "company_news": company_news,
-        "market_context": market_context,
-        "product_mentions": product_mentions,
-    }
-    
-    # Cache
-    _enrichment_cache[cache_key] = {"data": result, "timestamp": datetime.now().timestamp()}
-    
-    return result
+    async def fetch_enrichment() -> Dict:
+        # Run the three queries concurrently; total latency is the slowest query
+        # instead of the sum of all three
+        company_news, market_context, product_mentions = await asyncio.gather(
+            query_exa(
+                f'"{assignee}" (funding OR partnership OR acquisition OR lawsuit OR patent OR regulation)'
+            ),
+            query_exa(
+                f"{tech_context} market analysis industry report adoption competitors"
+            ),
+            query_exa(
+                f'"{assignee}" {" ".join(key_terms[:2])} (product OR launch OR "powered by" OR announces)'
+            ),
+        )
+
+        result = {
+            "patent_id": patent_id,
+            "available": True,
+            "assignee": assignee,
+            "company_news": company_news,
+            "market_context": market_context,
+            "product_mentions": product_mentions,
+        }
+
+        # Cache
+        await cache_set(_enrichment_cache, cache_key, result)
+
+        return result
+
+    return await single_flight(cache_key, fetch_enrichment)
 
 async def handle_citations(req: UnifiedRequest) -> Dict:
     """Get citation data for a patent using the PatentsView citation endpoint."""
@@ -530,41 +711,42 @@ async def handle_citations(req: UnifiedRequest) -> Dict:
     if not patent_id:
         raise HTTPException(status_code=400, detail="patent_id required")
     
-    patent_num = patent_id.upper().replace("US", "").strip()
-    
+    patent_num = normalize_patent_id(patent_id)
+
     citation_url = "https://search.patentsview.org/api/v1/patent/us_patent_citation/"
     
     try:
         patent_url = "https://search.patentsview.org/api/v1/patent/"
         
-        # Get patents that cite this one (forward citations)
-        # Query where citation_patent_id = our patent (meaning other patents cite us)
-        r = await http_client.post(citation_url, headers=get_patentsview_headers(), json={
-            "q": {"citation_patent_id": patent_num},
-            "f": ["patent_id", "citation_patent_id", "citation_date", "citation_category"],
-            "o": {"size": 20}
-        })
+        # Forward citations: citation_patent_id = our patent (others cite us)
+        # Backward citations: patent_id = our patent (we cite others)
+        # Two concurrent queries so each direction gets its own 20-row budget;
+        # a combined _or query lets one heavily-cited side starve the other
+        citation_fields = ["patent_id", "citation_patent_id", "citation_date", "citation_category"]
+        r, r2 = await asyncio.gather(
+            http_client.post(citation_url, headers=get_patentsview_headers(), json={
+                "q": {"citation_patent_id": patent_num},
+                "f": citation_fields,
+                "o": {"size": 20}
+            }),
+            http_client.post(citation_url, headers=get_patentsview_headers(), json={
+                "q": {"patent_id": patent_num},
+                "f": citation_fields,
+                "o": {"size": 20}
+            }),
+        )
         r.raise_for_status()
-        
-        data = r.json()
-        cited_by_raw = data.get("us_patent_citations", [])
-        
-        # Get patents that this patent cites (backward citations)
-        # Query where patent_id = our patent (meaning we cite other patents)
-        r2 = await http_client.post(citation_url, headers=get_patentsview_headers(), json={
-            "q": {"patent_id": patent_num},
-            "f": ["patent_id", "citation_patent_id", "citation_date", "citation_category"],
-            "o": {"size": 20}
-        })
         r2.raise_for_status()
+
+        cited_by_raw = orjson.loads(r.content).get("us_patent_citations", [])
+        cites_raw = orjson.loads(r2.content).get("us_patent_citations", [])
         
-        data2 = r2.json()
-        cites_raw = data2.get("us_patent_citations", [])
-        
-        # Extract unique patent IDs that need details fetched
-        cited_by_ids = [c.get("patent_id", "").upper() for c in cited_by_raw]
-        cites_ids = [c.get("citation_patent_id", "").upper() for c in cites_raw]
-        all_patent_ids = list(set([id for id in cited_by_ids + cites_ids if id]))
+        # Extract unique patent IDs that need details fetched; one set union,
+        # no intermediate lists, and each ID is uppercased exactly once
+        all_patent_ids = list(
+            {pid for c in cited_by_raw if (pid := c.get("patent_id", "").upper())}
+            | {pid for c in cites_raw if (pid := c.get("citation_patent_id", "").upper())}
+        )
         
         # Fetch patent details (title, date, assignee) for all cited patents
         patent_details_map = {}
@@ -575,7 +757,7 @@ async def handle_citations(req: UnifiedRequest) -> Dict:
                 "o": {"size": len(all_patent_ids)}
             })
             if r_details.is_success:
-                details_data = r_details.json()
+                details_data = orjson.loads(r_details.content)
                 for p in details_data.get("patents", []):
                     patent_id_upper = str(p.get("patent_id", "")).upper()
                     assignees = p.get("assignees", [])
@@ -619,6 +801,8 @@ async def handle_citations(req: UnifiedRequest) -> Dict:
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Citations fetch error: {str(e)}")
 
+_CPC_GROUP_ID = itemgetter("cpc_group_id")
+
 async def handle_assignee_patents(req: UnifiedRequest) -> Dict:
     """Find other patents from the same assignee."""
     assignee = req.assignee
@@ -636,22 +820,24 @@ async def handle_assignee_patents(req: UnifiedRequest) -> Dict:
             "s": [{"patent_date": "desc"}]
         })
         r.raise_for_status()
-        data = r.json()
-        
-        exclude_id = req.patent_id.upper().replace("US", "") if req.patent_id else None
-        patents = []
+        data = orjson.loads(r.content)
         
-        for p in data.get("patents", []):
-            if exclude_id and p["patent_id"] == exclude_id:
-                continue
-            if len(patents) >= limit:
-                break
-            patents.append({
+        exclude_id = normalize_patent_id(req.patent_id) if req.patent_id else None
+
+        # islice stops iterating once `limit` rows survive the exclusion filter
+        filtered = (
+            p for p in data.get("patents", [])
+            if not (exclude_id and p["patent_id"] == exclude_id)
+        )
+        patents = [
+            {
                 "patent_id": f"US{p['patent_id']}",
                 "patent_title": p.get("patent_title"),
                 "patent_date": p.get("patent_date"),
-                "cpc_codes": [c.get("cpc_group_id") for c in (p.get("cpc_current") or [])[:3]],
-            })
+                "cpc_codes": list(map(_CPC_GROUP_ID, (p.get("cpc_current") or ())[:3])),
+            }
+            for p in islice(filtered, limit)
+        ]
         
         return {
             "assignee": assignee,